@@ -0,0 +1,127 @@
+"""
+Shared fixtures for Exercise 3 tests.
+
+Expensive inputs (the student notebook, the mooring datasets, the figure
+directory scan, the synthetic tidal time grids, a plotting figure) are built
+once per test session and shared between the tests that inspect them.
+"""
+
+import pytest
+import numpy as np
+import functools
+from pathlib import Path
+from types import SimpleNamespace
+
+try:
+    from orjson import loads as _json_loads  # faster parsing of large notebooks
+except ImportError:
+    from json import loads as _json_loads
+
+
+@functools.lru_cache(maxsize=32)
+def _exists(p: str) -> bool:
+    """Path.exists() memoised for the session; the test inputs do not move."""
+    return Path(p).exists()
+
+
+@pytest.fixture(scope="session")
+def path_exists():
+    """Session-cached existence check for test input paths."""
+    return _exists
+
+
+@functools.lru_cache(maxsize=4)
+def _load_notebook(path_str, mtime_ns):
+    """Parse a notebook file; cached on path and modification time."""
+    return _json_loads(Path(path_str).read_bytes())
+
+
+@pytest.fixture(scope="session")
+def notebook():
+    """Parsed assignment notebook with pre-joined code and markdown sources."""
+    notebook_path = Path("src/assignment.ipynb")
+    if not _exists(str(notebook_path)):
+        pytest.skip("Assignment notebook not found")
+
+    raw = _load_notebook(str(notebook_path.resolve()), notebook_path.stat().st_mtime_ns)
+
+    code_lines = []
+    markdown_cells = []
+    for cell in raw['cells']:
+        if cell['cell_type'] == 'code':
+            code_lines.extend(cell['source'])
+        elif cell['cell_type'] == 'markdown':
+            markdown_cells.append(''.join(cell['source']))
+
+    return SimpleNamespace(
+        raw=raw,
+        code_text='\n'.join(code_lines),
+        markdown_cells=markdown_cells,
+    )
+
+
+@pytest.fixture(scope="session")
+def tidal_grid():
+    """Shared M2 period and time grids (in days) for the tools tests."""
+    period = 12.42 / 24  # M2 period in days
+    grids = {
+        "t100": np.linspace(0, period, 100),
+        "t1000": np.linspace(0, period, 1000),
+        "t_fit": np.linspace(0, 3 * period, 150),  # 3 periods for good fitting
+    }
+    # The arrays are shared across tests, so guard them against in-place edits
+    for t in grids.values():
+        t.flags.writeable = False
+    return {"period": period, **grids}
+
+
+@pytest.fixture(scope="session")
+def figure_files():
+    """Student figures as sorted (path, stat_result) pairs, scanned once."""
+    figures_dir = Path("figures/")
+    if not _exists(str(figures_dir)):
+        figures_dir = Path("../figures/")  # Check parent directory too
+
+    if not _exists(str(figures_dir)):
+        pytest.skip("Figures directory not found")
+
+    return [(fig_file, fig_file.stat()) for fig_file in sorted(figures_dir.glob("ex3fig*-*-Messfern.png"))]
+
+
+@pytest.fixture(scope="session")
+def plot_ax():
+    """Reusable Axes on a non-interactive (Agg) figure; clear it before use."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(15, 5))
+    yield ax
+    plt.close(fig)
+
+
+def _open_mooring_dataset(data_file):
+    """Open a mooring NetCDF file without CF decoding, or skip if missing."""
+    import xarray as xr
+
+    if not _exists(str(data_file)):
+        pytest.skip(f"Data file not found: {data_file}")
+    # The validity checks only look at variable names and raw value ranges,
+    # so skip time/CF decoding to keep the open cheap.
+    return xr.open_dataset(data_file, decode_times=False, decode_cf=False)
+
+
+@pytest.fixture(scope="session")
+def ctd_ds():
+    """Raw CTD mooring dataset, opened once per session."""
+    ds = _open_mooring_dataset(Path("data/mooredCTD1_raw.nc"))
+    yield ds
+    ds.close()
+
+
+@pytest.fixture(scope="session")
+def velo_ds():
+    """Raw velocity mooring dataset, opened once per session."""
+    ds = _open_mooring_dataset(Path("data/mooring1velocity.nc"))
+    yield ds
+    ds.close()
@@ -9,25 +9,28 @@ For detailed completion checking, see test_completion.py
 """
 
 import pytest
+import importlib
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
 
 
-def test_imports_work():
+@pytest.mark.parametrize("module_name", [
+    "matplotlib.pyplot",
+    "numpy",
+    "xarray",
+    "scipy.signal",
+    "scipy.optimize",
+    "gsw",
+])
+def test_imports_work(module_name):
     """Test that required packages can be imported."""
     try:
-        import matplotlib.pyplot as plt
-        import numpy as np
-        import xarray as xr
-        import scipy.signal as sg
-        from scipy.optimize import curve_fit
-        import gsw
+        importlib.import_module(module_name)
     except ImportError as e:
-        pytest.fail(f"Failed to import required package: {e}")
+        pytest.fail(f"Failed to import required package {module_name}: {e}")
 
 
-def test_notebook_exists():
+def test_notebook_exists(path_exists):
     """Test that the assignment notebook exists."""
     # Try different possible locations for the notebook
     possible_paths = [
@@ -39,14 +42,14 @@ def test_notebook_exists():
     
     notebook_found = False
     for path in possible_paths:
-        if path.exists():
+        if path_exists(str(path)):
             notebook_found = True
             break
     
     assert notebook_found, f"assignment.ipynb not found in any of these locations: {[str(p) for p in possible_paths]}"
 
 
-def test_data_files_exist():
+def test_data_files_exist(path_exists):
     """Test that the required data files exist."""
     # Try different possible locations for the data files
     ctd_paths = [
@@ -61,8 +64,8 @@ def test_data_files_exist():
         Path("./mooring1velocity.nc")
     ]
     
-    ctd_found = any(path.exists() for path in ctd_paths)
-    velocity_found = any(path.exists() for path in velocity_paths)
+    ctd_found = any(path_exists(str(path)) for path in ctd_paths)
+    velocity_found = any(path_exists(str(path)) for path in velocity_paths)
     
     # Data files are optional since they can be downloaded/provided
     if not ctd_found:
@@ -98,26 +101,21 @@ def test_harmonic_function():
 
 def test_curve_fitting_capability():
     """Test that curve fitting functionality works."""
-    from scipy.optimize import curve_fit
-    
-    def simple_cosine(x, a, b, c):
-        return a * np.cos(x + b) + c
-    
     # Generate test data
+    np.random.seed(42)  # For reproducible tests
     x = np.linspace(0, 4*np.pi, 100)
     y_true = 2 * np.cos(x + 0.5) + 3
     y_noisy = y_true + np.random.normal(0, 0.1, len(x))
     
-    # Test curve fitting
-    try:
-        popt, pcov = curve_fit(simple_cosine, x, y_noisy, p0=[1, 0, 0])
-        assert len(popt) == 3, "Should return 3 fitted parameters"
-        assert np.all(np.isfinite(popt)), "Fitted parameters should be finite"
-    except Exception as e:
-        pytest.fail(f"Curve fitting failed: {e}")
+    # Test curve fitting: a*cos(x + b) + c = A*cos(x) + B*sin(x) + c is linear in (A, B, c)
+    design = np.column_stack([np.cos(x), np.sin(x), np.ones_like(x)])
+    (A, B, C), *_ = np.linalg.lstsq(design, y_noisy, rcond=None)
+    popt = (np.hypot(A, B), -np.arctan2(B, A), C)
+    np.testing.assert_allclose(popt, (2, 0.5, 3), atol=0.1,
+                               err_msg="Curve fitting did not recover the known parameters")
 
 
-def test_basic_time_series_plotting():
+def test_basic_time_series_plotting(plot_ax):
     """Test that basic time series plotting functionality works."""
     # Create sample time series data
     time = np.linspace(0, 10, 1000)  # 10 days
@@ -125,8 +123,9 @@ def test_basic_time_series_plotting():
     noise = np.random.normal(0, 0.1, len(time))
     salinity = tidal_signal + noise
     
-    # Test basic plotting
-    fig, ax = plt.subplots(figsize=(15, 5))
+    # Test basic plotting on the shared axes
+    ax = plot_ax
+    ax.clear()
     
     ax.plot(time, salinity, label='Salinity')
     ax.set_xlabel('Time (days)')
@@ -139,8 +138,6 @@ def test_basic_time_series_plotting():
     assert len(ax.lines) > 0, "Plot should contain data lines"
     assert ax.get_xlabel() != '', "X-axis should be labeled"
     assert ax.get_ylabel() != '', "Y-axis should be labeled"
-    
-    plt.close(fig)
 
 
 def test_filtering_concepts():
@@ -151,9 +148,11 @@ def test_filtering_concepts():
     high_freq = 0.5 * np.sin(2 * np.pi * time * 2)  # High frequency
     signal = low_freq + high_freq
     
-    # Simple moving average filter
+    # Simple moving average filter (running sum, padded back to the input length)
     window_size = 50
-    filtered_signal = np.convolve(signal, np.ones(window_size)/window_size, mode='same')
+    cumulative = np.cumsum(np.insert(signal, 0, 0))
+    filtered_signal = (cumulative[window_size:] - cumulative[:-window_size]) / window_size
+    filtered_signal = np.pad(filtered_signal, (window_size // 2, window_size - 1 - window_size // 2), mode='edge')
     
     # Test that filtering reduces high frequency content
     # (This is a simplified test - in practice, frequency analysis would be more appropriate)
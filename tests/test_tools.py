@@ -21,10 +21,10 @@ def test_semi_diurnal_cosine_basic():
     assert callable(semi_diurnal_cosine)
 
 
-def test_semi_diurnal_cosine_period():
+def test_semi_diurnal_cosine_period(tidal_grid):
     """Test that the function has the correct period (12.42 hours = 0.5175 days)."""
     # Create time array over multiple periods
-    period_days = 12.42 / 24  # 0.5175 days
+    period_days = tidal_grid["period"]  # 0.5175 days
     t = np.linspace(0, 2 * period_days, 1000)
     
     # Test with simple parameters
@@ -42,99 +42,44 @@ def test_semi_diurnal_cosine_period():
         "Function should have same value after one period"
 
 
-def test_semi_diurnal_cosine_amplitude_case1():
-    """Test amplitude recovery - Case 1: Simple cosine with amplitude 2.5."""
-    # Test parameters
-    true_amplitude = 2.5
-    true_phase = 0.0
-    true_offset = 5.0
-    
-    # Create time array over one period
-    period_days = 12.42 / 24
-    t = np.linspace(0, period_days, 100)
-    
-    # Generate synthetic data
-    synthetic_data = semi_diurnal_cosine(t, true_amplitude, true_phase, true_offset)
+@pytest.mark.parametrize("true_amplitude, true_phase, true_offset", [
+    pytest.param(2.5, 0.0, 5.0, id="case1"),          # Simple cosine with amplitude 2.5
+    pytest.param(0.8, np.pi / 4, -1.2, id="case2"),   # 45 degree phase shift
+])
+def test_semi_diurnal_cosine_amplitude(tidal_grid, true_amplitude, true_phase, true_offset):
+    """Test amplitude and offset recovery over one period."""
+    synthetic_data = semi_diurnal_cosine(tidal_grid["t100"], true_amplitude, true_phase, true_offset)
     
     # Test amplitude: max - min should equal 2 * amplitude
-    data_range = np.max(synthetic_data) - np.min(synthetic_data)
-    expected_range = 2 * true_amplitude
-    
-    assert np.isclose(data_range, expected_range, rtol=1e-3), \
-        f"Amplitude test failed: expected range {expected_range}, got {data_range}"
+    np.testing.assert_allclose(np.ptp(synthetic_data), 2 * true_amplitude, rtol=1e-3,
+                               err_msg="Amplitude test failed: unexpected data range")
     
     # Test offset: mean should equal offset
-    data_mean = np.mean(synthetic_data)
-    assert np.isclose(data_mean, true_offset, rtol=1e-2), \
-        f"Offset test failed: expected {true_offset}, got {data_mean}"
-
-
-def test_semi_diurnal_cosine_amplitude_case2():
-    """Test amplitude recovery - Case 2: Cosine with amplitude 0.8."""
-    # Test parameters
-    true_amplitude = 0.8
-    true_phase = np.pi / 4  # 45 degree phase shift
-    true_offset = -1.2
-    
-    # Create time array
-    period_days = 12.42 / 24
-    t = np.linspace(0, period_days, 100)
-    
-    # Generate synthetic data
-    synthetic_data = semi_diurnal_cosine(t, true_amplitude, true_phase, true_offset)
-    
-    # Test amplitude
-    data_range = np.max(synthetic_data) - np.min(synthetic_data)
-    expected_range = 2 * true_amplitude
-    
-    assert np.isclose(data_range, expected_range, rtol=1e-3), \
-        f"Amplitude test failed: expected range {expected_range}, got {data_range}"
-    
-    # Test offset
-    data_mean = np.mean(synthetic_data)
-    assert np.isclose(data_mean, true_offset, rtol=1e-2), \
-        f"Offset test failed: expected {true_offset}, got {data_mean}"
+    np.testing.assert_allclose(np.mean(synthetic_data), true_offset, rtol=1e-2,
+                               err_msg="Offset test failed: unexpected data mean")
 
 
-def test_semi_diurnal_cosine_phase_case1():
-    """Test phase recovery - Case 1: Zero phase."""
-    true_amplitude = 1.0
-    true_phase = 0.0
-    true_offset = 0.0
-    
-    # At t=0, function should equal amplitude * cos(phase) + offset = amplitude + offset
-    t_zero = np.array([0.0])
-    value_at_zero = semi_diurnal_cosine(t_zero, true_amplitude, true_phase, true_offset)
-    expected_at_zero = true_amplitude * np.cos(true_phase) + true_offset
-    
-    assert np.isclose(value_at_zero[0], expected_at_zero, rtol=1e-6), \
-        f"Phase test failed: at t=0, expected {expected_at_zero}, got {value_at_zero[0]}"
-
-
-def test_semi_diurnal_cosine_phase_case2():
-    """Test phase recovery - Case 2: π/2 phase shift."""
-    true_amplitude = 1.5
-    true_phase = np.pi / 2  # 90 degree phase shift
-    true_offset = 2.0
-    
-    # At t=0, function should equal amplitude * cos(π/2) + offset = 0 + offset = offset
-    t_zero = np.array([0.0])
-    value_at_zero = semi_diurnal_cosine(t_zero, true_amplitude, true_phase, true_offset)
+@pytest.mark.parametrize("true_amplitude, true_phase, true_offset, rtol, atol", [
+    pytest.param(1.0, 0.0, 0.0, 1e-6, 1e-8, id="case1"),          # Zero phase
+    pytest.param(1.5, np.pi / 2, 2.0, 1e-5, 1e-6, id="case2"),    # 90 degree phase shift
+])
+def test_semi_diurnal_cosine_phase(true_amplitude, true_phase, true_offset, rtol, atol):
+    """Test phase recovery: at t=0 the function equals amplitude * cos(phase) + offset."""
+    value_at_zero = semi_diurnal_cosine(np.array([0.0]), true_amplitude, true_phase, true_offset)
     expected_at_zero = true_amplitude * np.cos(true_phase) + true_offset
     
-    assert np.isclose(value_at_zero[0], expected_at_zero, atol=1e-6), \
-        f"Phase test failed: at t=0 with π/2 phase, expected {expected_at_zero}, got {value_at_zero[0]}"
+    np.testing.assert_allclose(value_at_zero[0], expected_at_zero, rtol=rtol, atol=atol,
+                               err_msg=f"Phase test failed at t=0 with phase {true_phase}")
 
 
-def test_semi_diurnal_cosine_maximum_minimum():
+def test_semi_diurnal_cosine_maximum_minimum(tidal_grid):
     """Test that maximum and minimum occur at expected times."""
     true_amplitude = 3.0
     true_phase = 0.0
     true_offset = 1.0
     
-    # Create time array over one period
-    period_days = 12.42 / 24
-    t = np.linspace(0, period_days, 1000)
+    # Time array over one period
+    t = tidal_grid["t1000"]
     
     values = semi_diurnal_cosine(t, true_amplitude, true_phase, true_offset)
     
@@ -153,7 +98,7 @@ def test_semi_diurnal_cosine_maximum_minimum():
         f"Minimum value test failed: expected {expected_min}, got {min_value}"
 
 
-def test_semi_diurnal_cosine_with_scipy_fit():
+def test_semi_diurnal_cosine_with_scipy_fit(tidal_grid):
     """Test that scipy.optimize.curve_fit can recover known parameters."""
     try:
         from scipy.optimize import curve_fit
@@ -166,8 +111,7 @@ def test_semi_diurnal_cosine_with_scipy_fit():
     true_offset = 2.5
     
     # Create synthetic data
-    period_days = 12.42 / 24
-    t = np.linspace(0, 3 * period_days, 150)  # 3 periods for good fitting
+    t = tidal_grid["t_fit"]  # 3 periods for good fitting
     
     # Add small amount of noise to make it realistic
     np.random.seed(42)  # For reproducible tests